@@ -4,7 +4,8 @@ import sys
 import time
 from http import HTTPStatus
 from logging import StreamHandler
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Final, List, Optional
 
 import requests
 import telegram
@@ -19,39 +20,65 @@ PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
-RETRY_PERIOD = 600
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
-HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+RETRY_PERIOD: Final = 600
+ENDPOINT: Final = (
+    'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+)
+HEADERS: Final = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_TIMEOUT: Final = (5, 30)
+TELEGRAM_TIMEOUT: Final = 10
+# Повторное сообщение с тем же текстом не отправляется, пока не истёк
+# TTL (в секундах); переопределяется переменной окружения.
+MESSAGE_CACHE_TTL: Final = int(os.getenv('MESSAGE_CACHE_TTL', 24 * 3600))
 
 
-HOMEWORK_VERDICTS = {
+HOMEWORK_VERDICTS: Final = MappingProxyType({
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
+})
+
+# Готовые шаблоны сообщений о статусе: вердикт не меняется между
+# вызовами, при форматировании подставляется только имя работы.
+HOMEWORK_TEMPLATES: Final = {
+    status: 'Изменился статус проверки работы "%s". ' + verdict
+    for status, verdict in HOMEWORK_VERDICTS.items()
 }
 
+# Валидаторы кеша (ETag/Last-Modified) из последнего ответа API;
+# отправляются со следующим запросом, чтобы получить 304 вместо
+# полного тела, когда данные не изменились.
+_CACHE_VALIDATORS: Dict = {}
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 handler = StreamHandler(sys.stdout)
 formatter = logging.Formatter(
-    '%(asctime)s [%(levelname)s] %(message)s'
+    '%(asctime)s [%(levelname)s] %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
 )
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
+# Поля thread/process в записях лога не используются форматтером,
+# их сбор можно отключить.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.raiseExceptions = False
 
-def check_tokens():
+
+def check_tokens() -> bool:
     """
     Checks that the required environment variables are set.
 
     Returns:
         bool: True if all env variables have value
     """
-    tokens = (PRACTICUM_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_TOKEN)
-    return all(tokens)
+    return all((PRACTICUM_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_TOKEN))
 
 
-def send_message(bot, message):
+def send_message(bot: telegram.Bot, message: str) -> None:
     """
     Sends a message to a Telegram chat using the specified bot.
 
@@ -60,10 +87,11 @@ def send_message(bot, message):
         message (str): The message to send.
     """
     try:
-        logger.debug(f'Отправка сообщения: {message}')
+        logger.debug('Отправка сообщения: %s', message)
         bot.send_message(
             chat_id=TELEGRAM_CHAT_ID,
-            text=message
+            text=message,
+            timeout=TELEGRAM_TIMEOUT
         )
     except telegram.error.TelegramError as error:
         message = f'Сообщение не удалось отправить: {error}'
@@ -73,26 +101,49 @@ def send_message(bot, message):
         logger.debug('Отправлено сообщение')
 
 
-def get_api_answer(timestamp):
+def _remember_cache_validators(response: requests.Response) -> None:
+    """
+    Saves cache validators from the API response headers.
+
+    Args:
+        response (requests.Response): Successful response from the API.
+    """
+    response_headers = getattr(response, 'headers', None)
+    if response_headers is None:
+        return
+    etag = response_headers.get('ETag')
+    if etag:
+        _CACHE_VALIDATORS['If-None-Match'] = etag
+    last_modified = response_headers.get('Last-Modified')
+    if last_modified:
+        _CACHE_VALIDATORS['If-Modified-Since'] = last_modified
+
+
+def get_api_answer(timestamp: int) -> Optional[Dict]:
     """Makes a request homework_statuses to an API Practicum.
 
     Args:
         timestamp (int): The UNIX timestamp to use in the API request.
 
     Returns:
-        dict: The JSON response from the API.
+        dict: The JSON response from the API, or None if the API
+        reported 304 Not Modified for the cached validators.
     """
+    if _CACHE_VALIDATORS:
+        headers = {**HEADERS, **_CACHE_VALIDATORS}
+    else:
+        headers = HEADERS
     request_params = {
         'url': ENDPOINT,
-        'headers': {'Authorization': f'OAuth {PRACTICUM_TOKEN}'},
-        'params': {'from_date': timestamp}
+        'headers': headers,
+        'params': {'from_date': timestamp},
+        'timeout': REQUEST_TIMEOUT
     }
     try:
-        logging.info(
-            (
-                'Начинаем подключение к эндпоинту {url}, с параметрами'
-                ' headers = {headers} ;params= {params}.'
-            ).format(**request_params)
+        logger.info(
+            'Начинаем подключение к эндпоинту %(url)s, с параметрами'
+            ' headers = %(headers)s ;params= %(params)s.',
+            request_params
         )
         response = requests.get(**request_params)
     except Exception as error:
@@ -106,6 +157,8 @@ def get_api_answer(timestamp):
                 **request_params
             )
         )
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        return None
     if response.status_code != HTTPStatus.OK:
         raise WrongAPIResponse(
             'Ответ сервера не является успешным:'
@@ -113,12 +166,17 @@ def get_api_answer(timestamp):
             f' http_code = {response.status_code};'
             f' reason = {response.reason}; content = {response.text}'
         )
-    else:
+    try:
         homework_statuses = response.json()
+    except ValueError as error:
+        raise WrongAPIResponse(
+            f'Я.Практикум вернул некорректный json: {error}'
+        )
+    _remember_cache_validators(response)
     return homework_statuses
 
 
-def check_response(response):
+def check_response(response: Dict) -> List:
     """
     Checks the structure of the response JSON homework_statuses.
 
@@ -129,18 +187,21 @@ def check_response(response):
         message = f'Я.Практикум вернул неожиданную структуру json: {response}'
         logger.error(message)
         raise TypeError('Ошибка в типе ответа API')
-    if "homeworks" not in response or "current_date" not in response:
+    try:
+        homeworks = response['homeworks']
+        response['current_date']
+    except KeyError:
         message = f'Я.Практикум вернул неожиданную структуру json: {response}'
         logger.error(message)
         raise WrongAPIResponse(message)
-    if not isinstance(response.get("homeworks"), list):
+    if not isinstance(homeworks, list):
         message = f'Я.Практикум вернул неожиданный homeworks: {response}'
         logger.error(message)
         raise TypeError(message)
-    return response.get('homeworks')
+    return homeworks
 
 
-def parse_status(homework):
+def parse_status(homework: Dict) -> str:
     """
     Parses the status of a homework_statuses.
 
@@ -150,28 +211,61 @@ def parse_status(homework):
     Returns:
         str: A message describing the status of the homework submission.
     """
-    if "homework_name" in homework:
-        homework_name = homework.get('homework_name')
-    else:
+    try:
+        homework_name = homework['homework_name']
+    except KeyError:
         message = f'Я.Практикум вернул json без homework_name: {homework}'
         logger.error(message)
         raise WrongAPIResponse(message)
-    if "status" in homework:
-        status = homework.get('status')
-    else:
+    try:
+        status = homework['status']
+    except KeyError:
         message = f'Я.Практикум вернул json без status: {homework}'
         logger.error(message)
         raise WrongAPIResponse(message)
-    if status not in HOMEWORK_VERDICTS:
+    try:
+        template = HOMEWORK_TEMPLATES[status]
+    except KeyError:
         message = f'Я.Практикум вернул неожиданный статус: {status}'
         logger.error(message)
         raise StatusNotExpected(message)
 
-    verdict = HOMEWORK_VERDICTS[status]
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return template % homework_name
 
 
-def main():
+def _deliver_report(bot: telegram.Bot, report: Dict,
+                    prev_sig: Optional[int], sent_expiry: Dict) -> int:
+    """
+    Sends the report to Telegram unless it is a recent duplicate.
+
+    A report is suppressed when it matches the previous one or when the
+    same text was already sent within MESSAGE_CACHE_TTL (a flapping
+    status would otherwise be re-sent on every change back).
+
+    Args:
+        bot (telegram.Bot): The Telegram bot to use.
+        report (dict): The current report with 'name' and 'output'.
+        prev_sig (int): Signature of the previously sent report.
+        sent_expiry (dict): Report signature -> monotonic expiry time.
+
+    Returns:
+        int: The signature of the current report.
+    """
+    now = time.monotonic()
+    for key in [k for k, expiry in sent_expiry.items() if expiry <= now]:
+        del sent_expiry[key]
+    sig = hash((report['name'], report['output']))
+    if sig == prev_sig:
+        logger.debug('В ответе нет новых статусов.')
+    elif sig in sent_expiry:
+        logger.debug('Такое сообщение недавно уже отправлялось.')
+    else:
+        send_message(bot, report['output'])
+        sent_expiry[sig] = now + MESSAGE_CACHE_TTL
+    return sig
+
+
+def main() -> None:
     """Основная логика работы бота."""
     if not check_tokens():
         message = (
@@ -179,41 +273,60 @@ def main():
             ' TELEGRAM_TOKEN, TELEGRAM_CHAT_ID.'
             ' Программа принудительно остановлена.'
         )
-        logging.critical(message)
+        logger.critical(message)
         sys.exit(message)
 
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     current_timestamp = int(time.time())
     current_report: Dict = {'name': '', 'output': ''}
-    prev_report: Dict = current_report.copy()
+    prev_sig = None
+    sent_expiry: Dict = {}
+    next_deadline = time.monotonic() + RETRY_PERIOD
 
     while True:
         try:
             response = get_api_answer(current_timestamp)
-            current_timestamp = response.get('current_date', current_timestamp)
+            if response is None:
+                logger.debug('Данные API не изменились с прошлого опроса.')
+                continue
             new_homeworks = check_response(response)
+            current_timestamp = response.get('current_date', current_timestamp)
             if new_homeworks:
-                current_report['name'] = new_homeworks[0]['homework_name']
-                current_report['output'] = parse_status(new_homeworks[0])
+                last_homework = new_homeworks[0]
+                current_report['output'] = parse_status(last_homework)
+                current_report['name'] = last_homework['homework_name']
             else:
                 current_report['output'] = (
                     f'За период от {current_timestamp} до настоящего момента'
                     ' домашних работ нет.'
                 )
-            if current_report != prev_report:
-                send_message(bot, current_report)
-                prev_report = current_report.copy()
-            else:
-                logging.debug('В ответе нет новых статусов.')
-        except Exception as error:
+            prev_sig = _deliver_report(
+                bot, current_report, prev_sig, sent_expiry
+            )
+        except (
+            ConnectionError,
+            WrongAPIResponse,
+            StatusNotExpected,
+            MessageNotSent,
+            TypeError
+        ) as error:
             message = f'Сбой в работе программы: {error}'
             current_report['output'] = message
-            logging.error(message, exc_info=True)
-            if current_report != prev_report:
-                send_message(bot, current_report)
-                prev_report = current_report.copy()
+            logger.error(message)
+            prev_sig = _deliver_report(
+                bot, current_report, prev_sig, sent_expiry
+            )
+        except Exception as error:
+            logger.error(
+                'Неожиданный сбой в работе программы: %s', error,
+                exc_info=True
+            )
+            raise
         finally:
-            time.sleep(RETRY_PERIOD)
+            now = time.monotonic()
+            delay = max(0, round(next_deadline - now))
+            next_deadline = max(next_deadline, now) + RETRY_PERIOD
+            time.sleep(delay)
 
 
 if __name__ == '__main__':